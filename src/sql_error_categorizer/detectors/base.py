@@ -2,12 +2,14 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Callable
+from typing import Any, Callable, Hashable, TypeVar
 
 from sql_error_taxonomy import SqlErrors
-from sqlscope.query import Query
+from sqlscope.query import Query, Select
 
-@dataclass(repr=False)
+T = TypeVar('T')
+
+@dataclass(repr=False, frozen=True, slots=True)
 class DetectedError:
     '''Represents a detected SQL error with its type and associated data.'''
 
@@ -37,6 +39,36 @@ class BaseDetector(ABC):
         self.solutions = solutions
         self.update_query = update_query
 
+    @property
+    def query(self) -> Query:
+        '''The query being analyzed. Assigning a new query discards results cached for the previous one.'''
+        return self._query
+
+    @query.setter
+    def query(self, query: Query) -> None:
+        self._query = query
+        self._query_cache: dict[Hashable, Any] = {}
+
+    def cached(self, key: Hashable, compute: Callable[[], T]) -> T:
+        '''
+            Return the value cached under `key` for the current query, computing it on first use.
+
+            Keys referring to selects should use `id(select)`: selects live as long as their query,
+            and the cache is discarded whenever a new query is assigned.
+        '''
+        if key not in self._query_cache:
+            self._query_cache[key] = compute()
+        return self._query_cache[key]
+
+    def strip_subqueries(self, select: Select, replacement: str = 'NULL') -> Select:
+        '''
+            Return `select` with its subqueries stripped, computing it at most once per query.
+
+            Stripping re-parses and re-typechecks the select, so the result is shared across checks.
+            Callers must not modify the returned AST in place.
+        '''
+        return self.cached(('strip_subqueries', id(select), replacement), lambda: select.strip_subqueries(replacement))
+
     @abstractmethod
     def run(self) -> list[DetectedError]:
         '''Run the detector and return a list of detected errors with their descriptions'''
@@ -1,14 +1,10 @@
 '''Detector for complications in SQL queries.'''
 
-import difflib
-import re
-import sqlparse
-import sqlparse.keywords
 from typing import Callable
 from sqlglot import exp
 from sql_error_taxonomy import SqlErrors
-from sqlscope.catalog import ConstraintType, ConstraintColumn, Constraint
-from sqlscope import Query, Catalog
+from sqlscope.catalog import Constraint, ConstraintType, ConstraintColumn
+from sqlscope import Query
 from sqlscope import util
 
 from .base import BaseDetector, DetectedError
@@ -139,11 +135,11 @@ class ComplicationDetector(BaseDetector):
         for select in self.query.selects:
             ast = select.ast
 
-            if not ast:
+            if ast is None:
                 continue
 
             for like in ast.find_all(exp.Like):
-                pattern_expr = like.args.get('expression')
+                pattern_expr = like.expression
                 
                 if not pattern_expr:
                     # Malformed LIKE expression
@@ -179,11 +175,14 @@ class ComplicationDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
-            if not select.ast:
+            if select.ast is None:
                 continue
 
+            # UNIQUE constraints are computed on the first column argument, since `all_constraints` is expensive
+            unique_constraints: list[Constraint] | None = None
+
             for agg_func in select.ast.find_all(exp.AggFunc):
                 if not isinstance(agg_func.this, exp.Distinct):
                     continue
@@ -205,11 +204,14 @@ class ComplicationDetector(BaseDetector):
                     # Check if the argument is a column
                     if isinstance(expr, exp.Column):
                         column_name = util.ast.column.get_real_name(expr)
+                        columns = { ConstraintColumn(column_name, table_idx=select._get_table_idx_for_column(expr)) }
+
+                        if unique_constraints is None:
+                            unique_constraints = [c for c in select.all_constraints if c.constraint_type == ConstraintType.UNIQUE]
 
                         # Check if the column has a UNIQUE constraint
-                        unique_constraints = [c for c in select.all_constraints if c.constraint_type == ConstraintType.UNIQUE]
                         for constraint in unique_constraints:
-                            if { ConstraintColumn(column_name, table_idx=select._get_table_idx_for_column(expr)) } == constraint.columns:
+                            if columns == constraint.columns:
                                 results.append(DetectedError(SqlErrors.COM_92_UNNECESSARY_DISTINCT_IN_AGGREGATE_FUNCTION, (str(agg_func),)))
                                 break
         return results
@@ -259,17 +261,17 @@ class ComplicationDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
             if not select.group_by:
                 continue
 
-            if not select.ast:
+            if select.ast is None:
                 continue
 
             has_agg_func = False
             for expression in select.ast.expressions:
-                if list(expression.find_all(exp.AggFunc)):
+                if expression.find(exp.AggFunc) is not None:
                     has_agg_func = True
                     break
 
@@ -278,13 +280,11 @@ class ComplicationDetector(BaseDetector):
 
             select_columns: list[exp.Column] = []
             for expression in select.ast.expressions:
-                columns = list(expression.find_all(exp.Column))
-                select_columns.extend(columns)
+                select_columns.extend(expression.find_all(exp.Column))
             
             group_by_columns: list[exp.Column] = []
             for expression in select.group_by:
-                columns = list(expression.find_all(exp.Column))
-                group_by_columns.extend(columns)
+                group_by_columns.extend(expression.find_all(exp.Column))
 
             select_col_names = {(util.ast.column.get_real_name(col), select._get_table_idx_for_column(col)) for col in select_columns}
             group_by_col_names = {(util.ast.column.get_real_name(col), select._get_table_idx_for_column(col)) for col in group_by_columns}
@@ -392,27 +392,27 @@ class ComplicationDetector(BaseDetector):
         return columns
     def _find_underlying_column(self, node: dict):
         '''
-        Recursively traverses an expression node to find the underlying column identifier.
+        Traverses an expression node to find the underlying column identifier.
         '''
-        if not isinstance(node, dict):
-            return None
-        
-        node_class = node.get('class')
-
-        if node_class == 'Paren':
-            return self._find_underlying_column(node.get('args', {}).get('this'))
+        # Unwrap parentheses and aliases iteratively rather than recursing once per level
+        while isinstance(node, dict):
+            node_class = node.get('class')
 
-        if node_class == 'Column':
-            try:
-                return node['args']['expression']['args']['this']
-            except (KeyError, TypeError):
+            if node_class == 'Column':
                 try:
-                    return node['args']['this']['args']['this']
+                    return node['args']['expression']['args']['this']
                 except (KeyError, TypeError):
-                    return None
+                    try:
+                        return node['args']['this']['args']['this']
+                    except (KeyError, TypeError):
+                        return None
 
-        if node_class == 'Alias':
-            return self._find_underlying_column(node.get('args', {}).get('this'))
+            if node_class not in ('Paren', 'Alias'):
+                return None
+
+            node = node.get('args', {}).get('this')
+
+        return None
     def _get_from_tables(self, ast: dict, with_alias=False) -> list:
         '''
         Extracts a list of all table names from the FROM and JOIN clauses of a query's AST.
@@ -1,15 +1,23 @@
 '''Detector for logical errors in SQL queries.'''
 
 from dataclasses import dataclass
-import difflib
-import re
-import sqlparse
-import sqlparse.keywords
-from typing import Callable
+from typing import Callable, Final
 from sql_error_taxonomy import SqlErrors
 
 from .base import BaseDetector, DetectedError
-from sqlscope.query import Query, Select, SetOperation
+from sqlscope.query import Query, SetOperation
+
+# AST node classes walked by `_get_comparisons`
+_COMPARISON_OPERATORS: Final[frozenset[str]] = frozenset({'EQ', 'NE', 'GT', 'GTE', 'LT', 'LTE'})
+_LOGICAL_OPERATORS: Final[frozenset[str]] = frozenset({'And', 'Or'})
+
+
+@dataclass(frozen=True, slots=True)
+class TableCol:
+    '''Table/column pair used when comparing joins against the solutions.'''
+    table: str
+    column: str
+
 
 class LogicalErrorDetector(BaseDetector):
     '''Detector for logical errors in SQL queries.'''
@@ -185,11 +193,6 @@ class LogicalErrorDetector(BaseDetector):
             2. Extraneous Join: An unnecessary table is included in the proposed query.
             3. Incorrect Join: A table is included, but it is not the correct one needed for the join.
         '''
-                
-        @dataclass(frozen=True)
-        class TableCol:
-            table: str
-            column: str
 
         results: list[DetectedError] = []
 
@@ -598,8 +601,7 @@ class LogicalErrorDetector(BaseDetector):
         args = node.get('args', {})
 
         # Base case: The node is a comparison operator (e.g., EQ, LT, GT).
-        comparison_operators = {'EQ', 'NE', 'GT', 'GTE', 'LT', 'LTE'}
-        if node_class in comparison_operators:
+        if node_class in _COMPARISON_OPERATORS:
             left_operand = args.get('this', {})
             right_operand = args.get('expression', {})
 
@@ -614,8 +616,7 @@ class LogicalErrorDetector(BaseDetector):
             return []
 
         # Recursive step: The node is a logical combiner (AND, OR).
-        logical_operators = {'And', 'Or'}
-        if node_class in logical_operators:
+        if node_class in _LOGICAL_OPERATORS:
             left_results = self._get_comparisons(args.get('this'))
             right_results = self._get_comparisons(args.get('expression'))
             return left_results + right_results
@@ -682,30 +683,31 @@ class LogicalErrorDetector(BaseDetector):
 
     def _find_underlying_column(self, node: dict):
         '''
-        Recursively traverses an expression node to find the underlying column identifier.
+        Traverses an expression node to find the underlying column identifier.
         '''
-        if not isinstance(node, dict):
-            return None
-        
-        node_class = node.get('class')
+        # Unwrap aliases iteratively rather than recursing once per level
+        while isinstance(node, dict):
+            node_class = node.get('class')
 
-        # Base case: We found a column. Handle both qualified and simple names.
-        if node_class == 'Column':
-            try:
-                # Qualified column name, e.g., c1.cID -> 'cID'
-                return node['args']['expression']['args']['this']
-            except (KeyError, TypeError):
+            # Base case: We found a column. Handle both qualified and simple names.
+            if node_class == 'Column':
                 try:
-                    # Simple column name, e.g., cID -> 'cID'
-                    return node['args']['this']['args']['this']
+                    # Qualified column name, e.g., c1.cID -> 'cID'
+                    return node['args']['expression']['args']['this']
                 except (KeyError, TypeError):
-                    return None
+                    try:
+                        # Simple column name, e.g., cID -> 'cID'
+                        return node['args']['this']['args']['this']
+                    except (KeyError, TypeError):
+                        return None
+
+            # The node is an alias, so check the aliased expression.
+            if node_class != 'Alias':
+                # Return None if it's another type of expression (e.g., a function or literal)
+                return None
+
+            node = node.get('args', {}).get('this')
 
-        # Recursive step: The node is an alias, so check the aliased expression.
-        if node_class == 'Alias':
-            return self._find_underlying_column(node.get('args', {}).get('this'))
-        
-        # Return None if it's another type of expression (e.g., a function or literal)
         return None
     
     def _selects_star(self, ast: dict) -> bool:
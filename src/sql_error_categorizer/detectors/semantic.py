@@ -1,13 +1,9 @@
 '''Detector for semantic errors in SQL queries.'''
 
-import difflib
 import re
-import sqlparse
-import sqlparse.keywords
-from typing import Callable
+from typing import Callable, Final
 from sqlglot import exp
-from z3 import Solver, Not, unsat, Or, And, BoolSort, is_expr
-import sqlglot
+from z3 import Not, Or, And
 from sql_error_taxonomy import SqlErrors
 from sqlscope import util
 from sqlscope.query import Query, smt
@@ -128,7 +124,7 @@ class SemanticErrorDetector(BaseDetector):
             for select in solution.selects:
                 ast = select.ast
 
-                if not ast:
+                if ast is None:
                     continue
 
                 for func in ast.find_all(exp.Sum):
@@ -143,7 +139,7 @@ class SemanticErrorDetector(BaseDetector):
         for select in self.query.selects:
             ast = select.ast
 
-            if not ast:
+            if ast is None:
                 continue
 
             if not allow_sum_distinct:
@@ -183,29 +179,23 @@ class SemanticErrorDetector(BaseDetector):
             for select in solution.selects:
                 ast = select.ast
 
-                if not ast:
+                if ast is None:
                     continue
 
                 for eq in ast.find_all(exp.EQ):
                     left = eq.this
                     right = eq.expression
 
-                    if isinstance(left, exp.Literal):
-                        if has_character(left, '_'):
-                            allow_underscore = True
-                        if has_character(left, '%'):
-                            allow_percent = True
-
-                    if isinstance(right, exp.Literal):
-                        if has_character(right, '_'):
-                            allow_underscore = True
-                        if has_character(right, '%'):
-                            allow_percent = True
+                    for operand in (left, right):
+                        if isinstance(operand, exp.Literal):
+                            chars = _wildcard_characters(operand)
+                            allow_underscore = allow_underscore or '_' in chars
+                            allow_percent = allow_percent or '%' in chars
 
         for select in self.query.selects:
             ast = select.ast
 
-            if not ast:
+            if ast is None:
                 continue
 
             for eq in ast.find_all(exp.EQ):
@@ -213,18 +203,20 @@ class SemanticErrorDetector(BaseDetector):
                 right = eq.expression
 
                 if isinstance(left, exp.Literal):
-                    if not allow_underscore and has_character(left, '_'):
+                    chars = _wildcard_characters(left)
+                    if not allow_underscore and '_' in chars:
                         results.append(DetectedError(SqlErrors.SEM_43_WILDCARDS_WITHOUT_LIKE, (str(eq),)))
                         continue
-                    if not allow_percent and has_character(left, '%'):
+                    if not allow_percent and '%' in chars:
                         results.append(DetectedError(SqlErrors.SEM_43_WILDCARDS_WITHOUT_LIKE, (str(eq),)))
                         continue
 
                 if isinstance(right, exp.Literal):
-                    if not allow_underscore and has_character(right, '_'):
+                    chars = _wildcard_characters(right)
+                    if not allow_underscore and '_' in chars:
                         results.append(DetectedError(SqlErrors.SEM_43_WILDCARDS_WITHOUT_LIKE, (str(eq),)))
                         continue
-                    if not allow_percent and has_character(right, '%'):
+                    if not allow_percent and '%' in chars:
                         results.append(DetectedError(SqlErrors.SEM_43_WILDCARDS_WITHOUT_LIKE, (str(eq),)))
                         continue
 
@@ -253,56 +245,59 @@ class SemanticErrorDetector(BaseDetector):
             for select in solution.selects:
                 ast = select.ast
 
-                if not ast:
+                if ast is None:
                     continue
 
                 for like in ast.find_all(exp.Like):
                     pattern = like.expression
                     if isinstance(pattern, exp.Literal):
-                        if has_character(pattern, '_'):
+                        chars = _wildcard_characters(pattern)
+                        if '_' in chars:
                             underscore_in_solution = True
-                        if has_character(pattern, '%'):
+                        if '%' in chars:
                             percent_in_solution = True
-                        if has_character(pattern, '*'):
+                        if '*' in chars:
                             star_in_solution = True
-                        if has_character(pattern, '?'):
+                        if '?' in chars:
                             question_mark_in_solution = True
 
         # Then check the user query
         for select in self.query.selects:
             ast = select.ast
 
-            if not ast:
+            if ast is None:
                 continue
 
             for like in ast.find_all(exp.Like):
                 pattern = like.expression
                 if isinstance(pattern, exp.Literal):
+                    chars = _wildcard_characters(pattern)
+
                     if not self.solutions:
                         # No solutions to compare against
                         # Fall back to detecting just '*' or '?' usage
-                        if has_character(pattern, '*') or has_character(pattern, '?'):
+                        if '*' in chars or '?' in chars:
                             results.append(DetectedError(SqlErrors.SEM_44_INCORRECT_WILDCARD, (str(like),)))
                         continue
 
                     # query contains '*' while solution does not
                     # most likely an attempt to use '%' wildcard
-                    if not star_in_solution and has_character(pattern, '*'):
+                    if not star_in_solution and '*' in chars:
                         results.append(DetectedError(SqlErrors.SEM_44_INCORRECT_WILDCARD, (str(like),)))
 
                     # query contains '?' while solution does not
                     # most likely an attempt to use '_' wildcard
-                    if not question_mark_in_solution and has_character(pattern, '?'):
+                    if not question_mark_in_solution and '?' in chars:
                         results.append(DetectedError(SqlErrors.SEM_44_INCORRECT_WILDCARD, (str(like),)))
 
                     # '_' instead of '%'
                     if percent_in_solution and not underscore_in_solution:
-                        if has_character(pattern, '_') and not has_character(pattern, '%'):
+                        if '_' in chars and '%' not in chars:
                             results.append(DetectedError(SqlErrors.SEM_44_INCORRECT_WILDCARD, (str(like),)))
 
                     # '%' instead of '_'
                     if underscore_in_solution and not percent_in_solution:
-                        if has_character(pattern, '%') and not has_character(pattern, '_'):
+                        if '%' in chars and '_' not in chars:
                             results.append(DetectedError(SqlErrors.SEM_44_INCORRECT_WILDCARD, (str(like),)))
 
 
@@ -495,4 +490,18 @@ def has_character(literal: exp.Literal, chars: str) -> bool:
         return False
 
     return any(c in value for c in chars)
+
+_WILDCARD_CHARACTERS: Final[frozenset[str]] = frozenset('%_*?')
+
+def _wildcard_characters(literal: exp.Literal) -> frozenset[str]:
+    '''
+        Return which of the wildcard-like characters ('%', '_', '*', '?') the literal contains.
+        Lets callers test several characters against a single scan of the value.
+    '''
+    value = literal.this
+
+    if not isinstance(value, str):
+        return frozenset()
+
+    return _WILDCARD_CHARACTERS.intersection(value)
 # endregion 
@@ -5,16 +5,52 @@ import difflib
 import re
 import sqlparse
 from sqlglot import exp
-from typing import Callable
-from copy import deepcopy
+from typing import Callable, Final
 from sql_error_taxonomy import SqlErrors
 from sqlscope import Query
+from sqlscope.query import Select
 from sqlscope.query.set_operations.set_operation import SetOperation
 from sqlscope.query.typechecking import get_type, collect_errors
 from sqlscope import util
 
 from .base import BaseDetector, DetectedError
 
+# Lowercase type names considered compatible with each other, built once at import
+_STRING_TYPES: Final[frozenset[str]] = frozenset({'varchar', 'text', 'char', 'string'})
+_NUMERIC_TYPES: Final[frozenset[str]] = frozenset({'int', 'integer', 'float', 'double', 'decimal', 'numeric', 'real'})
+
+# Upper-case names of the standard functions recognized by syn_5
+_KNOWN_FUNCTIONS: Final[frozenset[str]] = frozenset({
+    'SUM', 'AVG', 'COUNT', 'MIN', 'MAX',
+    'IN', 'EXISTS', 'ANY', 'ALL',
+    'COALESCE', 'NULLIF', 'CAST', 'CONVERT',
+    'UPPER', 'LOWER', 'LENGTH', 'SUBSTRING',
+    'NOW', 'CURRENT_DATE', 'CURRENT_TIME', 'CURRENT_TIMESTAMP',
+})
+
+# Keywords that start a clause of a SELECT statement, mapped to their position in the expected clause order
+_CLAUSE_ORDER: Final[dict[str, int]] = {
+    clause: i for i, clause in enumerate(['SELECT', 'FROM', 'WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT', 'OFFSET'])
+}
+_CLAUSE_KEYWORDS: Final[frozenset[str]] = frozenset(_CLAUSE_ORDER)
+
+# Token types that can hold a clause keyword
+_CLAUSE_TTYPES: Final = frozenset({sqlparse.tokens.DML, sqlparse.tokens.Keyword})
+
+# Token types of comparison/arithmetic operators
+_OPERATOR_TTYPES: Final = frozenset({sqlparse.tokens.Operator, sqlparse.tokens.Operator.Comparison})
+
+# Token types treated as whitespace when scanning for misplaced semicolons
+_WHITESPACE_TTYPES: Final = frozenset({sqlparse.tokens.Whitespace, sqlparse.tokens.Newline})
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnInfo:
+    '''Normalized column reference used when checking GROUP BY consistency.'''
+    name: str
+    alias: str
+    is_aggregated: bool = False
+
 
 class SyntaxErrorDetector(BaseDetector):
     '''Detector for syntax errors in SQL queries.'''
@@ -84,9 +120,10 @@ class SyntaxErrorDetector(BaseDetector):
                     # flags=re.IGNORECASE
                 )
 
-                # Use the corrected query from here on (across all detectors)
-                if corrected_sql != self.query.sql:
-                    self.update_query(corrected_sql, check.__name__)
+            # Use the corrected query from here on (across all detectors)
+            # NOTE: re-parse once per check, not once per correction
+            if corrected_sql != self.query.sql:
+                self.update_query(corrected_sql, check.__name__)
             
         # Proceed with all other checks
         checks = [
@@ -132,16 +169,36 @@ class SyntaxErrorDetector(BaseDetector):
             return True
 
         # Compatible string types
-        string_types = {'varchar', 'text', 'char', 'string'}
-        if type1 in string_types and type2 in string_types:
+        if type1 in _STRING_TYPES and type2 in _STRING_TYPES:
             return True
 
         # Compatible numeric types
-        numeric_types = {'int', 'integer', 'float', 'double', 'decimal', 'numeric', 'real'}
-        if type1 in numeric_types and type2 in numeric_types:
+        if type1 in _NUMERIC_TYPES and type2 in _NUMERIC_TYPES:
             return True
 
         return False
+
+    def _clause_counts(self, select: Select) -> dict[str, int]:
+        '''
+            Counts the clause keywords (SELECT, FROM, WHERE, ...) appearing at the top level of `select`,
+            excluding its subqueries. Computed in a single token pass and shared across checks.
+        '''
+
+        def count() -> dict[str, int]:
+            clause_count: dict[str, int] = {}
+            for ttype, val in self.strip_subqueries(select).tokens:
+                # only keyword tokens can be clauses: skip uppercasing everything else
+                if ttype not in _CLAUSE_TTYPES:
+                    continue
+
+                val_upper = val.upper()
+                if ttype == sqlparse.tokens.DML and val_upper == 'SELECT':
+                    clause_count[val_upper] = clause_count.get(val_upper, 0) + 1
+                if ttype == sqlparse.tokens.Keyword and val_upper in _CLAUSE_KEYWORDS:
+                    clause_count[val_upper] = clause_count.get(val_upper, 0) + 1
+            return clause_count
+
+        return self.cached(('clause_counts', id(select)), count)
     # endregion
 
     # region 1) Semicolons
@@ -158,7 +215,7 @@ class SyntaxErrorDetector(BaseDetector):
 
         all_tokens = []
         for statement in self.query.all_statements:
-            all_tokens.extend(list(statement.flatten()))
+            all_tokens.extend(statement.flatten())
         
         good_tokens = []
         trailing_semicolon_found = False
@@ -166,7 +223,7 @@ class SyntaxErrorDetector(BaseDetector):
         
         for token in reversed(all_tokens):  # start from end to preserve only the last semicolon
             # check for whitespace/newline
-            if token.ttype in (sqlparse.tokens.Whitespace, sqlparse.tokens.Newline):
+            if token.ttype in _WHITESPACE_TTYPES:
                 # keep as is and continue
                 good_tokens.append(token.value)
                 continue
@@ -213,7 +270,7 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
             if select.ast is None:
                 continue
@@ -253,11 +310,19 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
             if select.ast is None:
                 continue
 
+            # Index referenced columns once per select: column name -> names of the tables providing it.
+            # The same column is usually referenced many times (SELECT, WHERE, GROUP BY, ...),
+            # so this avoids rescanning every table for each reference.
+            tables_by_column: dict[str, list[str]] = {}
+            for table in select.referenced_tables:
+                for table_column in table.columns:
+                    tables_by_column.setdefault(table_column.name, []).append(table.name)
+
             for column in select.ast.find_all(exp.Column):
                 # skip `table.*` syntax, we only want to check actual column references
                 if isinstance(column.this, exp.Star):
@@ -266,23 +331,14 @@ class SyntaxErrorDetector(BaseDetector):
                 column_name = util.ast.column.get_name(column)
                 table_name = util.ast.column.get_table(column)
 
-                possible_matches = []
+                tables = tables_by_column.get(column_name, [])
 
                 if table_name:
                     # Qualified column (table.column)
-                    for table in select.referenced_tables:
-                        if table.name != table_name:
-                            continue
-
-                        for possible_match in table.columns:
-                            if possible_match.name == column_name:
-                                possible_matches.append(f'{table_name}.{column_name}')
+                    possible_matches = [f'{table_name}.{column_name}' for t in tables if t == table_name]
                 else:
                     # Unqualified column (column)
-                    for table in select.referenced_tables:
-                        for possible_match in table.columns:
-                            if possible_match.name == column_name:
-                                possible_matches.append(f'{table.name}.{column_name}')
+                    possible_matches = [f'{t}.{column_name}' for t in tables]
 
                 if len(possible_matches) == 0:
                     results.append(DetectedError(SqlErrors.SYN_4_UNDEFINED_COLUMN, (column.sql(),)))
@@ -296,17 +352,7 @@ class SyntaxErrorDetector(BaseDetector):
 
         results: list[DetectedError] = []
 
-        # standard_functions = {
-        known_aggregate_functions = {
-            'SUM', 'AVG', 'COUNT', 'MIN', 'MAX',
-            'IN', 'EXISTS', 'ANY', 'ALL',
-            'COALESCE', 'NULLIF', 'CAST', 'CONVERT',
-            'UPPER', 'LOWER', 'LENGTH', 'SUBSTRING',
-            'NOW', 'CURRENT_DATE', 'CURRENT_TIME', 'CURRENT_TIMESTAMP',
-        }
-        user_defined_functions = set() # TODO: self.catalog.functions
-
-        all_functions = known_aggregate_functions.union(user_defined_functions)
+        user_defined_functions: set[str] = set() # TODO: self.catalog.functions
 
         for func, clause in self.query.functions:
             func_name = func.get_name()
@@ -314,7 +360,8 @@ class SyntaxErrorDetector(BaseDetector):
             if func_name is None:
                 continue
             
-            if func_name.upper() not in all_functions:
+            func_name_upper = func_name.upper()
+            if func_name_upper not in _KNOWN_FUNCTIONS and func_name_upper not in user_defined_functions:
                 results.append(DetectedError(SqlErrors.SYN_5_UNDEFINED_FUNCTION, (func_name, clause)))
 
         return results
@@ -325,7 +372,7 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for token, val in self.query.tokens:
-            if any(val.startswith(p) for p in (':', '@', '?')):
+            if val.startswith((':', '@', '?')):
                 results.append(DetectedError(SqlErrors.SYN_6_UNDEFINED_PARAMETER, (val,)))
 
         return results
@@ -344,13 +391,13 @@ class SyntaxErrorDetector(BaseDetector):
         results: set[DetectedError] = set()     # use a set to avoid applying the same correction multiple times
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
             if select.ast is None:
                 continue
 
             for table in select.ast.find_all(exp.Table):
-                table = deepcopy(table)  # avoid modifying the original AST until we are sure we want to apply the correction
+                table = table.copy()  # avoid modifying the original AST until we are sure we want to apply the correction
                 table_str = table.sql()
                 table_name = util.ast.table.get_real_name(table)
                 schema_name = util.ast.table.get_schema(table)
@@ -361,7 +408,10 @@ class SyntaxErrorDetector(BaseDetector):
                         continue
 
                     # check "schema.table" for more accurate matches in edge cases (i.e. can't determine if the misspelled part is schema or table)
-                    available_tables = {f'{s}.{t}' for s in select.catalog.schema_names for t in select.catalog[s].table_names}
+                    available_tables = self.cached(
+                        ('qualified_table_names', id(select)),
+                        lambda: {f'{s}.{t}' for s in select.catalog.schema_names for t in select.catalog[s].table_names}
+                    )
                     match = difflib.get_close_matches(f'{schema_name}.{table_name}', available_tables, n=1, cutoff=0.6)
                     if match:
                         s, t = match[0].split('.')
@@ -382,7 +432,10 @@ class SyntaxErrorDetector(BaseDetector):
                     if select.catalog.has_table(select.search_path, table_name):
                         continue
 
-                    available_tables = {t for s in select.catalog.schema_names for t in select.catalog[s].table_names}
+                    available_tables = self.cached(
+                        ('table_names', id(select)),
+                        lambda: {t for s in select.catalog.schema_names for t in select.catalog[s].table_names}
+                    )
                     match = difflib.get_close_matches(table_name, available_tables, n=1, cutoff=0.6)
                     if match:
                         db = next(s for s in select.catalog.schema_names if select.catalog.has_table(s, match[0]))
@@ -401,7 +454,7 @@ class SyntaxErrorDetector(BaseDetector):
         results: set[DetectedError] = set()    # use a set to avoid applying the same correction multiple times
 
         for select in self.query.selects:
-            select = select.strip_subqueries()
+            select = self.strip_subqueries(select)
 
             if select.ast is None:
                 continue
@@ -411,7 +464,7 @@ class SyntaxErrorDetector(BaseDetector):
                 if isinstance(column.this, exp.Star):
                     continue
 
-                column = deepcopy(column)  # avoid modifying the original AST until we are sure we want to apply the correction
+                column = column.copy()  # avoid modifying the original AST until we are sure we want to apply the correction
                 column_str = column.sql()
                 column_name = util.ast.column.get_name(column)
                 table_name = util.ast.column.get_table(column)
@@ -432,10 +485,16 @@ class SyntaxErrorDetector(BaseDetector):
 
                 if table_name:
                     # Qualified column (table.column)
-                    available_columns = {f'{t.name}.{c.name}' for t in select.referenced_tables for c in t.columns}
+                    available_columns = self.cached(
+                        ('qualified_column_names', id(select)),
+                        lambda: {f'{t.name}.{c.name}' for t in select.referenced_tables for c in t.columns}
+                    )
                 else:
                     # Unqualified column (column)
-                    available_columns = {c.name for t in select.referenced_tables for c in t.columns}
+                    available_columns = self.cached(
+                        ('column_names', id(select)),
+                        lambda: {c.name for t in select.referenced_tables for c in t.columns}
+                    )
 
                 match = difflib.get_close_matches(column_name if not table_name else f'{table_name}.{column_name}', available_columns, n=1, cutoff=0.6)
                 if match:
@@ -741,7 +800,7 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            stripped = select.strip_subqueries()
+            stripped = self.strip_subqueries(select)
 
             if stripped.ast is None:
                 continue
@@ -765,12 +824,6 @@ class SyntaxErrorDetector(BaseDetector):
             All non-aggregated columns in HAVING must not be included in the GROUP BY clause.
         '''
 
-        @dataclass(frozen=True)
-        class ColumnInfo:
-            name: str
-            alias: str
-            is_aggregated: bool = False
-
         def get_column_name(col: exp.Column | exp.Alias) -> ColumnInfo:
             '''Return normalized column name and alias. If no alias, both are the same.'''
             col_name = util.ast.column.get_real_name(col)
@@ -795,7 +848,7 @@ class SyntaxErrorDetector(BaseDetector):
                     for table in select.referenced_tables:
                         for table_col in table.columns:
                             select_columns.append(ColumnInfo(table_col.name, table_col.name))
-                if isinstance(col, exp.Column) or isinstance(col, exp.Alias):
+                if isinstance(col, (exp.Column, exp.Alias)):
                     col_name = get_column_name(col)
                     select_columns.append(col_name)
                 elif isinstance(col, exp.Func):
@@ -876,13 +929,8 @@ class SyntaxErrorDetector(BaseDetector):
 
         for select in self.query.selects:
 
-            # By removing subqueries, we can check only the top-level WHERE clauses in this select.
-            stripped = select.strip_subqueries()
-
-            where_count = 0
-            for ttype, val in stripped.tokens:
-                if ttype == sqlparse.tokens.Keyword and val.upper() == 'WHERE':
-                    where_count += 1
+            # Counts exclude subqueries, so we check only the top-level WHERE clauses in this select.
+            where_count = self._clause_counts(select).get('WHERE', 0)
 
             if where_count > 1:
                 results.append(DetectedError(SqlErrors.SYN_19_USING_WHERE_TWICE, (select.sql, where_count)))
@@ -899,19 +947,11 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            stripped = select.strip_subqueries()
-
-            from_found = False
-            for ttype, val in stripped.tokens:
-                if ttype == sqlparse.tokens.Keyword and val.upper() == 'FROM':
-                    from_found = True
-                    break
-
-            if from_found:
+            if 'FROM' in self._clause_counts(select):
                 continue    # valid, has FROM clause
 
             # Check if selecting only constants/literals
-            for col in stripped.output.columns:
+            for col in self.strip_subqueries(select).output.columns:
                 if not col.is_constant:
                     results.append(DetectedError(SqlErrors.SYN_20_OMITTING_THE_FROM_CLAUSE, (select.sql,)))
                     break
@@ -925,7 +965,7 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            select = select.strip_subqueries(replacement='1')   # avoid false positives from subqueries
+            select = self.strip_subqueries(select, replacement='1')   # avoid false positives from subqueries
 
             if select.ast is None:
                 continue
@@ -948,20 +988,8 @@ class SyntaxErrorDetector(BaseDetector):
         '''
         results: list[DetectedError] = []
 
-        clause_keywords = {'SELECT', 'FROM', 'WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT', 'OFFSET'}
-        
         for select in self.query.selects:
-            stripped = select.strip_subqueries()
-
-            clause_count = {}
-            for ttype, val in stripped.tokens:
-                val_upper = val.upper()
-                if ttype == sqlparse.tokens.DML and val_upper == 'SELECT':
-                    clause_count[val_upper] = clause_count.get(val_upper, 0) + 1
-                if ttype == sqlparse.tokens.Keyword and val_upper in clause_keywords:
-                    clause_count[val_upper] = clause_count.get(val_upper, 0) + 1
-
-            for clause, count in clause_count.items():
+            for clause, count in self._clause_counts(select).items():
                 if count > 1:
                     results.append(DetectedError(SqlErrors.SYN_24_DUPLICATE_CLAUSE, (clause, count)))
 
@@ -1113,7 +1141,7 @@ class SyntaxErrorDetector(BaseDetector):
                             k_val_upper = k_val.upper().strip()
 
                             if (
-                                k_ttype in (sqlparse.tokens.Operator, sqlparse.tokens.Operator.Comparison)
+                                k_ttype in _OPERATOR_TTYPES
                                 or k_val_upper in {"IN", "NOT IN", "LIKE", "BETWEEN", "IS", "IS NOT"}
                             ):
                                 found_operator = True
@@ -1143,9 +1171,8 @@ class SyntaxErrorDetector(BaseDetector):
         results: list[DetectedError] = []
 
         for select in self.query.selects:
-            stripped = select.strip_subqueries()
+            stripped = self.strip_subqueries(select)
 
-            expected_order = ['SELECT', 'FROM', 'WHERE', 'GROUP BY', 'HAVING', 'ORDER BY', 'LIMIT', 'OFFSET']
             actual_order: list[str] = []
 
             for ttype, val in stripped.tokens:
@@ -1153,33 +1180,20 @@ class SyntaxErrorDetector(BaseDetector):
                     actual_order.append('SELECT')
                 elif ttype == sqlparse.tokens.Keyword:
                     val_upper = val.upper()
-                    if val_upper == 'FROM':
-                        actual_order.append('FROM')
-                    elif val_upper == 'WHERE':
-                        actual_order.append('WHERE')
-                    elif val_upper == 'GROUP BY':
-                        actual_order.append('GROUP BY')
-                    elif val_upper == 'HAVING':
-                        actual_order.append('HAVING')
-                    elif val_upper == 'ORDER BY':
-                        actual_order.append('ORDER BY')
-                    elif val_upper == 'LIMIT':
-                        actual_order.append('LIMIT')
-                    elif val_upper == 'OFFSET':
-                        actual_order.append('OFFSET')
+                    if val_upper in _CLAUSE_ORDER:
+                        actual_order.append(val_upper)
 
             # Check the order of clauses
             last_index = -1
             for clause in actual_order:
-                if clause in expected_order:
-                    current_index = expected_order.index(clause)
-                    if current_index < last_index:
-                        results.append(DetectedError(
-                            SqlErrors.SYN_30_CONFUSING_THE_ORDER_OF_KEYWORDS,
-                            (actual_order,)
-                        ))
-                        break
-                    last_index = current_index
+                current_index = _CLAUSE_ORDER[clause]
+                if current_index < last_index:
+                    results.append(DetectedError(
+                        SqlErrors.SYN_30_CONFUSING_THE_ORDER_OF_KEYWORDS,
+                        (actual_order,)
+                    ))
+                    break
+                last_index = current_index
 
         return results
         
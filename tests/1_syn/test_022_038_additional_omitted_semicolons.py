@@ -1,56 +1,25 @@
 from tests import *
-
-def test_end():
-    detected_errors = run_test(
-        query='''
-        SELECT column1, column2 FROM table1;;
-        ''',
-        detectors=[SyntaxErrorDetector]
-    )
-
-    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == 1
-    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == 0
-
-def test_middle():
-    detected_errors = run_test(
-        query='''
-        SELECT column1, column2; FROM table1
-        ''',
-        detectors=[SyntaxErrorDetector]
-    )
-
-    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == 1
-    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == 1
-
-def test_beginning():
-    detected_errors = run_test(
-        query='''
-        ;SELECT column1, column2 FROM table1;
-        ''',
-        detectors=[SyntaxErrorDetector]
-    )
-
-    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == 1
-    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == 0
-
-def test_correct():
-    detected_errors = run_test(
-        query='''
-        SELECT column1, column2 FROM table1;
-        ''',
-        detectors=[SyntaxErrorDetector]
-    )
-
-    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == 0
-    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == 0
-
-def test_none():
+import pytest
+
+@pytest.mark.parametrize('query, additional_count, omitted_count', [
+    # end
+    ('SELECT column1, column2 FROM table1;;', 1, 0),
+    # middle
+    ('SELECT column1, column2; FROM table1', 1, 1),
+    # beginning
+    (';SELECT column1, column2 FROM table1;', 1, 0),
+    # correct
+    ('SELECT column1, column2 FROM table1;', 0, 0),
+    # none
+    ('SELECT column1, column2 FROM table1', 0, 1),
+])
+def test_semicolons(query: str, additional_count: int, omitted_count: int):
     detected_errors = run_test(
-        query='''
-        SELECT column1, column2 FROM table1
+        query=f'''
+        {query}
         ''',
         detectors=[SyntaxErrorDetector]
     )
 
-    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == 0
-    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == 1
+    assert count_errors(detected_errors, SqlErrors.SYN_38_ADDITIONAL_SEMICOLON) == additional_count
+    assert count_errors(detected_errors, SqlErrors.SYN_22_OMITTING_THE_SEMICOLON) == omitted_count
@@ -1,17 +1,39 @@
+from functools import cached_property, lru_cache
 from typing import Any
 from sql_error_categorizer import SqlErrors, Catalog, load_catalog
 from sql_error_categorizer.detectors import Detector, BaseDetector, DetectedError
 from sql_error_categorizer import SyntaxErrorDetector, SemanticErrorDetector, LogicalErrorDetector, ComplicationDetector
 
+# Whether detectors print their debug trace, set by the `--detector-debug` pytest option (see conftest.py)
+DETECTOR_DEBUG = False
+
+class DetectedErrors(list[DetectedError]):
+    '''List of detected errors, also indexed by error type so assertions don't rescan the list.'''
+
+    @cached_property
+    def data_by_error(self) -> dict[SqlErrors, list[tuple[Any, ...]]]:
+        '''Data of the detected errors, grouped by error type. Built on first use.'''
+
+        # NOTE: data may contain unhashable values (e.g. lists), so it is stored in lists rather than sets
+        result: dict[SqlErrors, list[tuple[Any, ...]]] = {}
+        for detected_error in self:
+            result.setdefault(detected_error.error, []).append(detected_error.data)
+        return result
+
+@lru_cache(maxsize=None)
+def _load_catalog(catalog_filename: str) -> Catalog:
+    '''Load a test catalog once per session. Queries work on their own copy, so sharing it is safe.'''
+    return load_catalog(f'datasets/catalogs/{catalog_filename}.json')
+
 def run_test(query: str, *,
              catalog_filename: str | None = None,
              search_path: str | None = None, 
              detectors: list[type[BaseDetector]],
              solutions: list[str] = []
-    ) -> list[DetectedError]:
+    ) -> DetectedErrors:
     
     if catalog_filename:
-        catalog = load_catalog(f'datasets/catalogs/{catalog_filename}.json')
+        catalog = _load_catalog(catalog_filename)
     else:
         catalog = Catalog()
 
@@ -25,13 +47,16 @@ def run_test(query: str, *,
         search_path=search_path,
         solution_search_path=search_path,
         detectors=detectors,
-        debug=True
+        debug=DETECTOR_DEBUG
     )
 
-    return detector.run()
+    return DetectedErrors(detector.run())
 
 def has_error(detected_errors: list[DetectedError], error: SqlErrors, data: tuple[Any, ...] = ()) -> bool:
     '''Check if any detected error matches the given error type and data.'''
+    if isinstance(detected_errors, DetectedErrors):
+        return data in detected_errors.data_by_error.get(error, [])
+
     for detected_error in detected_errors:
         if detected_error.error == error and detected_error.data == data:
             return True
@@ -39,6 +64,9 @@ def has_error(detected_errors: list[DetectedError], error: SqlErrors, data: tupl
 
 def count_errors(detected_errors: list[DetectedError], error: SqlErrors) -> int:
     '''Count how many detected errors match the given error type.'''
+    if isinstance(detected_errors, DetectedErrors):
+        return len(detected_errors.data_by_error.get(error, []))
+
     count = 0
     for detected_error in detected_errors:
         if detected_error.error == error:
@@ -0,0 +1,12 @@
+import tests
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--detector-debug',
+        action='store_true',
+        default=False,
+        help='Print the detectors\' debug trace (query updates, catalog, detected errors) while running tests.',
+    )
+
+def pytest_configure(config):
+    tests.DETECTOR_DEBUG = config.getoption('--detector-debug')
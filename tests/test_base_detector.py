@@ -0,0 +1,27 @@
+from tests import *
+from sqlscope.query import Query
+
+def _make_detector(query: Query) -> SyntaxErrorDetector:
+    return SyntaxErrorDetector(query=query, update_query=lambda new_query, reason=None: None)
+
+def test_cached_reset_on_new_query():
+    detector = _make_detector(Query('SELECT 1;'))
+
+    assert detector.cached('key', lambda: 1) == 1
+    assert detector.cached('key', lambda: 2) == 1
+
+    detector.query = Query('SELECT 2;')
+
+    assert detector.cached('key', lambda: 2) == 2
+
+def test_strip_subqueries_reset_on_new_query():
+    old_query = Query('SELECT a FROM t WHERE a IN (SELECT b FROM u);')
+    detector = _make_detector(old_query)
+
+    old_stripped = detector.strip_subqueries(old_query.main_query)
+    assert detector.strip_subqueries(old_query.main_query) is old_stripped
+
+    # results are keyed by select id: after a new query is assigned, nothing from the old one may be reused
+    detector.query = Query('SELECT c FROM v;')
+
+    assert detector.strip_subqueries(old_query.main_query) is not old_stripped